@@ -3,13 +3,15 @@ Database Helper Functions
 
 MongoDB helper functions ready to use in your backend code.
 Import and use these functions in your API endpoints for database operations.
+They are built on Motor, so every helper is a coroutine and must be awaited.
 """
 
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime, timezone
 import os
+import time
 from dotenv import load_dotenv
-from typing import Union
+from typing import Optional, Union
 from pydantic import BaseModel
 
 # Load environment variables from .env file
@@ -21,12 +23,29 @@ db = None
 database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
+# A single module-level client is shared by the whole app; its connection
+# pool is reused across requests instead of reconnecting per query.
+POOL_OPTIONS = {
+    "maxPoolSize": 100,
+    "minPoolSize": 10,
+    "socketTimeoutMS": 10000,
+    "serverSelectionTimeoutMS": 5000,
+    "retryWrites": True,
+}
+
 if database_url and database_name:
-    _client = MongoClient(database_url)
+    _client = AsyncIOMotorClient(database_url, **POOL_OPTIONS)
     db = _client[database_name]
 
+# In-process TTL cache for aggregation results. Each collection carries a
+# version that writers bump through invalidate_cache, so writes made by this
+# process are seen immediately; writes from elsewhere show up within the TTL.
+_CACHE_MAXSIZE = 64
+_aggregate_cache = {}
+_collection_versions = {}
+
 # Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
+async def create_document(collection_name: str, data: Union[BaseModel, dict]):
     """Insert a single document with timestamp"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
@@ -40,10 +59,15 @@ def create_document(collection_name: str, data: Union[BaseModel, dict]):
     data_dict['created_at'] = datetime.now(timezone.utc)
     data_dict['updated_at'] = datetime.now(timezone.utc)
 
-    result = db[collection_name].insert_one(data_dict)
+    result = await db[collection_name].insert_one(data_dict)
+    invalidate_cache(collection_name)
     return str(result.inserted_id)
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
+def invalidate_cache(collection_name: str):
+    """Drop cached aggregation results for a collection after writing to it"""
+    _collection_versions[collection_name] = _collection_versions.get(collection_name, 0) + 1
+
+async def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
     """Get documents from collection"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
@@ -52,4 +76,42 @@ def get_documents(collection_name: str, filter_dict: dict = None, limit: int = N
     if limit:
         cursor = cursor.limit(limit)
     
-    return list(cursor)
+    return await cursor.to_list(length=limit or None)
+
+def iter_documents(collection_name: str, filter_dict: dict = None, limit: int = None, batch_size: int = 500):
+    """Get a cursor over collection documents for async iteration in batches"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    cursor = db[collection_name].find(filter_dict or {}).batch_size(batch_size)
+    if limit:
+        cursor = cursor.limit(limit)
+
+    return cursor
+
+async def aggregate_documents(collection_name: str, pipeline: list, cache_ttl: Optional[float] = None):
+    """Run an aggregation pipeline and return the resulting documents
+
+    With cache_ttl set, results are reused for that many seconds. Treat
+    the returned list as read-only since it may be shared between callers.
+    """
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    if not cache_ttl:
+        return await db[collection_name].aggregate(pipeline).to_list(length=None)
+
+    key = (collection_name, _collection_versions.get(collection_name, 0), repr(pipeline))
+    now = time.monotonic()
+    cached = _aggregate_cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    docs = await db[collection_name].aggregate(pipeline).to_list(length=None)
+    if len(_aggregate_cache) >= _CACHE_MAXSIZE:
+        for k in [k for k, (expires, _) in _aggregate_cache.items() if expires <= now]:
+            del _aggregate_cache[k]
+        if len(_aggregate_cache) >= _CACHE_MAXSIZE:
+            del _aggregate_cache[next(iter(_aggregate_cache))]
+    _aggregate_cache[key] = (now + cache_ttl, docs)
+    return docs
@@ -1,19 +1,50 @@
+import asyncio
 import os
-from datetime import datetime, timedelta, date
+import re
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from itertools import islice
 from typing import List, Optional
 
+import orjson
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import DuplicateKeyError, PyMongoError, ServerSelectionTimeoutError
 
-from database import db, create_document, get_documents
+from database import db, POOL_OPTIONS, create_document, iter_documents, aggregate_documents, invalidate_cache
 from schemas import (
     User, Employee, Team, Attendance, Leave, Task, Timesheet, Payroll, Job,
     Application, ResumeparseResult, Performance, Announcement, Ticket, Notification,
     InsightRequest, ResumeText,
 )
 
-app = FastAPI(title="Talent Ops Platform API")
+
+# Mongo returns naive datetimes that are UTC; orjson tags them as such
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+
+class UTCORJSONResponse(ORJSONResponse):
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Index creation and seeding run in the background so the server starts
+    # accepting requests right away, even when Mongo is slow or unreachable
+    startup = asyncio.create_task(_background_startup())
+    yield
+    startup.cancel()
+
+
+app = FastAPI(
+    title="Talent Ops Platform API",
+    lifespan=lifespan,
+    default_response_class=UTCORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,7 +61,7 @@ def root():
 
 
 @app.get("/test")
-def test_database():
+async def test_database():
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
@@ -38,13 +69,17 @@ def test_database():
         "database_name": None,
         "connection_status": "Not Connected",
         "collections": [],
+        "connection_pool_config": {
+            "max_pool_size": POOL_OPTIONS["maxPoolSize"],
+            "min_pool_size": POOL_OPTIONS["minPoolSize"],
+        },
     }
     try:
         if db is not None:
             response["database"] = "✅ Available"
             response["database_url"] = "✅ Set"
             try:
-                collections = db.list_collection_names()
+                collections = await db.list_collection_names()
                 response["collections"] = collections
                 response["database_name"] = db.name
                 response["connection_status"] = "Connected"
@@ -70,88 +105,125 @@ class CreateResponse(BaseModel):
     id: str
 
 
-def _collection_name(model_cls) -> str:
-    return model_cls.__name__.lower()
+_ENTITY_MODELS: dict[str, type[BaseModel]] = {
+    "user": User,
+    "employee": Employee,
+    "team": Team,
+    "attendance": Attendance,
+    "leave": Leave,
+    "task": Task,
+    "timesheet": Timesheet,
+    "payroll": Payroll,
+    "job": Job,
+    "application": Application,
+    "resumeparseresult": ResumeparseResult,
+    "performance": Performance,
+    "announcement": Announcement,
+    "ticket": Ticket,
+    "notification": Notification,
+}
+_ALLOWED_ENTITIES = frozenset(_ENTITY_MODELS)
 
 
 @app.post("/api/{entity}", response_model=CreateResponse)
 async def create_entity(entity: str, payload: dict):
-    mapping = {
-        "user": User,
-        "employee": Employee,
-        "team": Team,
-        "attendance": Attendance,
-        "leave": Leave,
-        "task": Task,
-        "timesheet": Timesheet,
-        "payroll": Payroll,
-        "job": Job,
-        "application": Application,
-        "resumeparseresult": ResumeparseResult,
-        "performance": Performance,
-        "announcement": Announcement,
-        "ticket": Ticket,
-        "notification": Notification,
-    }
-
-    if entity not in mapping:
+    model_cls = _ENTITY_MODELS.get(entity)
+    if model_cls is None:
         raise HTTPException(status_code=404, detail="Unknown entity")
 
-    model = mapping[entity](**payload)
-    inserted_id = create_document(entity, model)
+    model = model_cls.model_validate(payload)
+    try:
+        inserted_id = await create_document(entity, model)
+    except DuplicateKeyError:
+        # user.email, employee.user_id and team.name are unique-indexed
+        raise HTTPException(status_code=409, detail=f"{entity} already exists")
     return {"id": inserted_id}
 
 
 @app.get("/api/{entity}")
 async def list_entities(entity: str, limit: Optional[int] = 50):
-    allowed = {
-        "user",
-        "employee",
-        "team",
-        "attendance",
-        "leave",
-        "task",
-        "timesheet",
-        "payroll",
-        "job",
-        "application",
-        "resumeparseresult",
-        "performance",
-        "announcement",
-        "ticket",
-        "notification",
-    }
-    if entity not in allowed:
+    if entity not in _ALLOWED_ENTITIES:
         raise HTTPException(status_code=404, detail="Unknown entity")
 
-    docs = get_documents(entity, limit=limit)
+    items = aiter(iter_documents(entity, limit=limit))
+    # The cursor only hits the server on first iteration. Fetch the first
+    # document before streaming so connection errors still get a 500 rather
+    # than a 200 with a truncated body.
+    try:
+        first = await anext(items, None)
+    except PyMongoError as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)[:80]}")
+    return StreamingResponse(_stream_items(first, items), media_type="application/json")
+
+
+async def _stream_items(first, items):
+    # Emits {"items": [...]} one document at a time so memory stays bounded
+    # by the cursor batch rather than the full result set
+    yield b'{"items":['
+    if first is not None:
+        yield _encode_item(first)
+        async for d in items:
+            yield b"," + _encode_item(d)
+    yield b"]}"
+
+
+def _encode_item(d: dict) -> bytes:
     # Convert ObjectId to str if present
-    for d in docs:
-        if "_id" in d:
-            d["id"] = str(d.pop("_id"))
-    return {"items": docs}
+    if "_id" in d:
+        d["id"] = str(d.pop("_id"))
+    return orjson.dumps(d, default=str, option=_ORJSON_OPTIONS)
 
 
 # -----------------------------
 # Workforce analytics & insights
 # -----------------------------
 
+# Dashboards poll insights; short-lived caching absorbs overlapping requests
+_ANALYTICS_CACHE_TTL = 10
+
+# Ticket states counted as active. A tuple rather than a frozenset because it
+# is sent to Mongo in an $in filter, and BSON only encodes sequences.
+_OPEN_TICKET_STATES = ("open", "in_progress")
+
+_TASK_COUNTS_PIPELINE = [{"$group": {
+    "_id": None,
+    "total": {"$sum": 1},
+    "done": {"$sum": {"$cond": [{"$eq": ["$status", "done"]}, 1, 0]}},
+}}]
+
+
+async def _count(collection: str, match: Optional[dict] = None) -> int:
+    pipeline = [{"$match": match}] if match else []
+    pipeline.append({"$count": "n"})
+    docs = await aggregate_documents(collection, pipeline, cache_ttl=_ANALYTICS_CACHE_TTL)
+    return docs[0]["n"] if docs else 0
+
+
+async def _sum(collection: str, field: str) -> float:
+    docs = await aggregate_documents(
+        collection,
+        [{"$group": {"_id": None, "total": {"$sum": f"${field}"}}}],
+        cache_ttl=_ANALYTICS_CACHE_TTL,
+    )
+    return float(docs[0]["total"]) if docs else 0.0
+
+
 @app.post("/api/analytics/insights")
 async def analytics_insights(req: InsightRequest):
-    # Basic demo metrics using counts; in real-world, aggregate pipeline would be used
-    today = datetime.utcnow().date()
+    # Counts and sums are computed server-side so no documents are shipped back
+    today = datetime.now(timezone.utc).date()
     horizon = today + timedelta(days=req.horizon_days)
 
-    employees = len(get_documents("employee"))
-    tasks_total = len(get_documents("task"))
-    tasks_done = len([t for t in get_documents("task") if t.get("status") == "done"])
-    open_roles = len([j for j in get_documents("job") if j.get("status") == "open"])
-    tickets_open = len([t for t in get_documents("ticket") if t.get("status") in ("open", "in_progress")])
+    employees = await _count("employee")
+    task_counts = await aggregate_documents("task", _TASK_COUNTS_PIPELINE, cache_ttl=_ANALYTICS_CACHE_TTL)
+    tasks_total = task_counts[0]["total"] if task_counts else 0
+    tasks_done = task_counts[0]["done"] if task_counts else 0
+    open_roles = await _count("job", {"status": "open"})
+    tickets_open = await _count("ticket", {"status": {"$in": _OPEN_TICKET_STATES}})
 
     utilization = 0.0
-    ts = get_documents("timesheet")
     if employees:
-        total_hours = sum(float(x.get("hours", 0)) for x in ts)
+        total_hours = await _sum("timesheet", "hours")
         # naive utilization proxy: avg hours per day per employee over horizon/7 weeks
         utilization = round(min(100.0, (total_hours / max(1, employees)) / (req.horizon_days) * 100 / 8), 2)
 
@@ -172,7 +244,8 @@ async def analytics_insights(req: InsightRequest):
         f"and triage tickets older than 7 days."
     )
 
-    return {"summary": summary, "narrative": narrative}
+    # Returning the response directly skips FastAPI's jsonable_encoder pass
+    return UTCORJSONResponse({"summary": summary, "narrative": narrative})
 
 
 # -----------------------------
@@ -181,19 +254,21 @@ async def analytics_insights(req: InsightRequest):
 
 @app.post("/api/attendance/check-in")
 async def check_in(user_id: str, time: Optional[str] = None):
-    t = time or datetime.utcnow().strftime("%H:%M")
-    today = datetime.utcnow().date().isoformat()
-    rec = Attendance(user_id=user_id, date=date.fromisoformat(today), status="present", check_in=t)
-    _id = create_document("attendance", rec)
+    now = datetime.now(timezone.utc)
+    t = time or now.strftime("%H:%M")
+    # Server-built record, so skip model validation. BSON has no date type;
+    # the day is stored as YYYY-MM-DD, which Attendance parses back.
+    rec = {"user_id": user_id, "date": now.date().isoformat(), "status": "present", "check_in": t, "check_out": None}
+    _id = await create_document("attendance", rec)
     return {"id": _id, "message": "Checked in"}
 
 
 @app.post("/api/attendance/check-out")
 async def check_out(user_id: str, time: Optional[str] = None):
-    t = time or datetime.utcnow().strftime("%H:%M")
-    today = datetime.utcnow().date().isoformat()
-    rec = Attendance(user_id=user_id, date=date.fromisoformat(today), status="present", check_out=t)
-    _id = create_document("attendance", rec)
+    now = datetime.now(timezone.utc)
+    t = time or now.strftime("%H:%M")
+    rec = {"user_id": user_id, "date": now.date().isoformat(), "status": "present", "check_in": None, "check_out": t}
+    _id = await create_document("attendance", rec)
     return {"id": _id, "message": "Checked out"}
 
 
@@ -201,38 +276,62 @@ async def check_out(user_id: str, time: Optional[str] = None):
 # Hiring ATS: upload resume & parse (demo rule-based parser)
 # -----------------------------
 
+KEYWORDS = (
+    "python", "javascript", "react", "node", "aws", "docker", "kubernetes", "sql",
+    "fastapi", "django", "java", "c++", "ml", "nlp", "git", "linux",
+)
+
+# Multi-pattern automaton finds every keyword in one pass; optional dependency
+try:
+    import ahocorasick
+
+    _SKILLS_AUTOMATON = ahocorasick.Automaton()
+    for _k in KEYWORDS:
+        _SKILLS_AUTOMATON.add_word(_k, _k)
+    _SKILLS_AUTOMATON.make_automaton()
+except ImportError:
+    _SKILLS_AUTOMATON = None
+    # Single-pass regex fallback. The lookahead lets matches overlap, and
+    # keywords that prefix the longest match at the same offset (e.g. "java"
+    # in "javascript") are added back so results mirror the automaton.
+    _SKILLS_RE = re.compile(
+        "(?=(" + "|".join(re.escape(k) for k in sorted(KEYWORDS, key=len, reverse=True)) + "))"
+    )
+    _SKILL_PREFIXES = {k: tuple(p for p in KEYWORDS if k.startswith(p)) for k in KEYWORDS}
+
+# Email and years of experience are picked up in one scan of the text
+_RESUME_RE = re.compile(
+    r"(?P<email>[\w.+-]+@[\w-]+\.[\w.-]+)|(?P<years>\d+(?:\.\d+)?)\+?\s*years",
+    re.IGNORECASE,
+)
+
+
 @app.post("/api/ats/parse-text")
 async def parse_resume_text(payload: ResumeText):
     text = payload.text
     # Very lightweight heuristic parsing
-    lines = [l.strip() for l in text.splitlines() if l.strip()]
-    name = lines[0] if lines else None
-    email = next((l for l in lines if "@" in l and "." in l), None)
-    skills = []
-    keywords = [
-        "python", "javascript", "react", "node", "aws", "docker", "kubernetes", "sql",
-        "fastapi", "django", "java", "c++", "ml", "nlp", "git", "linux",
-    ]
-    lowered = text.lower()
-    for k in keywords:
-        if k in lowered:
-            skills.append(k)
+    raw_summary = list(islice(filter(None, map(str.strip, text.splitlines())), 10))
+    name = raw_summary[0] if raw_summary else None
+    email = None
     years = None
-    for l in lines:
-        if "years" in l.lower():
-            # naive extraction
-            for token in l.split():
-                if token.replace("+", "").replace(".", "").isdigit():
-                    years = float(token.replace("+", ""))
-                    break
-            if years:
-                break
+    for m in _RESUME_RE.finditer(text):
+        if m.group("email"):
+            email = email or m.group("email")
+        elif years is None:
+            years = float(m.group("years"))
+        if email and years is not None:
+            break
+    lowered = text.lower()
+    if _SKILLS_AUTOMATON is not None:
+        skills = {k for _, k in _SKILLS_AUTOMATON.iter(lowered)}
+    else:
+        skills = {p for m in _SKILLS_RE.finditer(lowered) for p in _SKILL_PREFIXES[m.group(1)]}
     return {
         "name": name,
         "email": email,
-        "skills": sorted(list(set(skills))),
+        "skills": sorted(skills),
         "years_experience": years,
-        "raw_summary": lines[:10],
+        "raw_summary": raw_summary,
     }
 
 
@@ -242,13 +341,13 @@ async def parse_resume_text(payload: ResumeText):
 
 @app.post("/api/announce")
 async def announce(payload: Announcement):
-    _id = create_document("announcement", payload)
+    _id = await create_document("announcement", payload)
     return {"id": _id}
 
 
 @app.post("/api/ticket")
 async def create_ticket(payload: Ticket):
-    _id = create_document("ticket", payload)
+    _id = await create_document("ticket", payload)
     return {"id": _id}
 
 
@@ -256,86 +355,71 @@ async def create_ticket(payload: Ticket):
 # Demo data seeding for executives, team leads, and employees
 # -----------------------------
 
-def _find_one(collection: str, filter_dict: dict):
-    docs = get_documents(collection, filter_dict=filter_dict, limit=1)
-    return docs[0] if docs else None
-
-
-def _get_or_create_user(name: str, email: str, role: str, department: Optional[str] = None) -> str:
-    existing = _find_one("user", {"email": email})
-    if existing:
-        return str(existing.get("_id"))
-    user = User(name=name, email=email, role=role, department=department)
-    return create_document("user", user)
-
-
-def _ensure_employee(user_id: str, employee_id: str, title: str, manager_id: Optional[str] = None, team: Optional[str] = None, location: Optional[str] = None, salary: Optional[float] = None) -> str:
-    existing = _find_one("employee", {"user_id": user_id})
-    if existing:
-        return str(existing.get("_id"))
-    emp = Employee(
-        user_id=user_id,
-        employee_id=employee_id,
-        title=title,
-        manager_id=manager_id,
-        team=team,
-        location=location,
-        salary=salary,
-    )
-    return create_document("employee", emp)
-
-
-def _ensure_team(name: str, lead_user_id: Optional[str], member_user_ids: list[str]) -> str:
-    existing = _find_one("team", {"name": name})
-    if existing:
-        return str(existing.get("_id"))
-    team = Team(name=name, lead_user_id=lead_user_id, members=member_user_ids)
-    return create_document("team", team)
-
-
-def seed_demo_data() -> dict:
-    created = {"users": 0, "employees": 0, "teams": 0}
-
-    # Executives
-    ceo_id = _get_or_create_user("Ava Patel", "ava.patel@demo.co", "executive", department="Executive")
-    vpops_id = _get_or_create_user("Liam Chen", "liam.chen@demo.co", "executive", department="Executive")
-
-    # Team Leads
-    eng_lead_uid = _get_or_create_user("Maya Ross", "maya.ross@demo.co", "team_lead", department="Engineering")
-    design_lead_uid = _get_or_create_user("Noah Green", "noah.green@demo.co", "team_lead", department="Design")
-
-    # Employees - Engineering
-    emma_uid = _get_or_create_user("Emma Johnson", "emma.johnson@demo.co", "employee", department="Engineering")
-    oliver_uid = _get_or_create_user("Oliver Smith", "oliver.smith@demo.co", "employee", department="Engineering")
-    sophia_uid = _get_or_create_user("Sophia Davis", "sophia.davis@demo.co", "employee", department="Engineering")
+def _seed_doc(model: BaseModel) -> dict:
+    now = datetime.now(timezone.utc)
+    doc = model.model_dump()
+    doc["created_at"] = now
+    doc["updated_at"] = now
+    return doc
+
+
+async def _upsert_many(collection: str, key: str, models: list) -> None:
+    # Insert-only upserts: existing records are matched on `key` and left untouched
+    ops = [UpdateOne({key: getattr(m, key)}, {"$setOnInsert": _seed_doc(m)}, upsert=True) for m in models]
+    await db[collection].bulk_write(ops, ordered=False)
+    invalidate_cache(collection)
+
+
+async def seed_demo_data() -> dict:
+    users = {
+        # Executives
+        "ceo": User(name="Ava Patel", email="ava.patel@demo.co", role="executive", department="Executive"),
+        "vpops": User(name="Liam Chen", email="liam.chen@demo.co", role="executive", department="Executive"),
+        # Team Leads
+        "eng_lead": User(name="Maya Ross", email="maya.ross@demo.co", role="team_lead", department="Engineering"),
+        "design_lead": User(name="Noah Green", email="noah.green@demo.co", role="team_lead", department="Design"),
+        # Employees - Engineering
+        "emma": User(name="Emma Johnson", email="emma.johnson@demo.co", role="employee", department="Engineering"),
+        "oliver": User(name="Oliver Smith", email="oliver.smith@demo.co", role="employee", department="Engineering"),
+        "sophia": User(name="Sophia Davis", email="sophia.davis@demo.co", role="employee", department="Engineering"),
+        # Employees - Design
+        "jack": User(name="Jack Wilson", email="jack.wilson@demo.co", role="employee", department="Design"),
+        "mia": User(name="Mia Thompson", email="mia.thompson@demo.co", role="employee", department="Design"),
+    }
+    await _upsert_many("user", "email", list(users.values()))
 
-    # Employees - Design
-    jack_uid = _get_or_create_user("Jack Wilson", "jack.wilson@demo.co", "employee", department="Design")
-    mia_uid = _get_or_create_user("Mia Thompson", "mia.thompson@demo.co", "employee", department="Design")
+    # One lookup resolves ids for both freshly upserted and pre-existing users
+    cursor = db["user"].find({"email": {"$in": [u.email for u in users.values()]}}, {"email": 1})
+    ids_by_email = {d["email"]: str(d["_id"]) async for d in cursor}
+    uid = {key: ids_by_email[u.email] for key, u in users.items()}
 
-    # Ensure Employee records with titles and relationships
-    _ensure_employee(ceo_id, "EMP1001", "Chief Executive Officer", manager_id=None, team="Executive", location="NYC", salary=300000)
-    _ensure_employee(vpops_id, "EMP1002", "VP, Operations", manager_id=ceo_id, team="Executive", location="NYC", salary=220000)
+    # Employee records with titles and relationships
+    await _upsert_many("employee", "user_id", [
+        Employee(user_id=uid["ceo"], employee_id="EMP1001", title="Chief Executive Officer", manager_id=None, team="Executive", location="NYC", salary=300000),
+        Employee(user_id=uid["vpops"], employee_id="EMP1002", title="VP, Operations", manager_id=uid["ceo"], team="Executive", location="NYC", salary=220000),
 
-    _ensure_employee(eng_lead_uid, "EMP2001", "Engineering Lead", manager_id=vpops_id, team="Engineering", location="Remote", salary=180000)
-    _ensure_employee(design_lead_uid, "EMP3001", "Design Lead", manager_id=vpops_id, team="Design", location="Remote", salary=170000)
+        Employee(user_id=uid["eng_lead"], employee_id="EMP2001", title="Engineering Lead", manager_id=uid["vpops"], team="Engineering", location="Remote", salary=180000),
+        Employee(user_id=uid["design_lead"], employee_id="EMP3001", title="Design Lead", manager_id=uid["vpops"], team="Design", location="Remote", salary=170000),
 
-    _ensure_employee(emma_uid, "EMP2002", "Senior Software Engineer", manager_id=eng_lead_uid, team="Engineering", location="Remote", salary=150000)
-    _ensure_employee(oliver_uid, "EMP2003", "Software Engineer", manager_id=eng_lead_uid, team="Engineering", location="Remote", salary=130000)
-    _ensure_employee(sophia_uid, "EMP2004", "QA Engineer", manager_id=eng_lead_uid, team="Engineering", location="Remote", salary=120000)
+        Employee(user_id=uid["emma"], employee_id="EMP2002", title="Senior Software Engineer", manager_id=uid["eng_lead"], team="Engineering", location="Remote", salary=150000),
+        Employee(user_id=uid["oliver"], employee_id="EMP2003", title="Software Engineer", manager_id=uid["eng_lead"], team="Engineering", location="Remote", salary=130000),
+        Employee(user_id=uid["sophia"], employee_id="EMP2004", title="QA Engineer", manager_id=uid["eng_lead"], team="Engineering", location="Remote", salary=120000),
 
-    _ensure_employee(jack_uid, "EMP3002", "Product Designer", manager_id=design_lead_uid, team="Design", location="Remote", salary=125000)
-    _ensure_employee(mia_uid, "EMP3003", "UX Researcher", manager_id=design_lead_uid, team="Design", location="Remote", salary=115000)
+        Employee(user_id=uid["jack"], employee_id="EMP3002", title="Product Designer", manager_id=uid["design_lead"], team="Design", location="Remote", salary=125000),
+        Employee(user_id=uid["mia"], employee_id="EMP3003", title="UX Researcher", manager_id=uid["design_lead"], team="Design", location="Remote", salary=115000),
+    ])
 
     # Teams with leads and members
-    _ensure_team("Engineering", lead_user_id=eng_lead_uid, member_user_ids=[eng_lead_uid, emma_uid, oliver_uid, sophia_uid])
-    _ensure_team("Design", lead_user_id=design_lead_uid, member_user_ids=[design_lead_uid, jack_uid, mia_uid])
-    _ensure_team("Executive", lead_user_id=ceo_id, member_user_ids=[ceo_id, vpops_id])
+    await _upsert_many("team", "name", [
+        Team(name="Engineering", lead_user_id=uid["eng_lead"], members=[uid["eng_lead"], uid["emma"], uid["oliver"], uid["sophia"]]),
+        Team(name="Design", lead_user_id=uid["design_lead"], members=[uid["design_lead"], uid["jack"], uid["mia"]]),
+        Team(name="Executive", lead_user_id=uid["ceo"], members=[uid["ceo"], uid["vpops"]]),
+    ])
 
     return {
-        "executives": [ceo_id, vpops_id],
-        "team_leads": [eng_lead_uid, design_lead_uid],
-        "employees": [emma_uid, oliver_uid, sophia_uid, jack_uid, mia_uid],
+        "executives": [uid["ceo"], uid["vpops"]],
+        "team_leads": [uid["eng_lead"], uid["design_lead"]],
+        "employees": [uid["emma"], uid["oliver"], uid["sophia"], uid["jack"], uid["mia"]],
         "teams": ["Engineering", "Design", "Executive"],
     }
 
@@ -344,24 +428,57 @@ def seed_demo_data() -> dict:
 async def seed_demo_endpoint():
     if db is None:
         raise HTTPException(status_code=500, detail="Database not available; set DATABASE_URL and DATABASE_NAME")
-    result = seed_demo_data()
+    result = await seed_demo_data()
     return {"status": "ok", "created": result}
 
 
+# Indexes backing the analytics filters, seeding upserts and per-user
+# attendance/timesheet lookups (newest first). create_index is idempotent.
+_INDEXES = [
+    ("task", "status", {}),
+    ("job", "status", {}),
+    ("ticket", "status", {}),
+    ("user", "email", {"unique": True}),
+    ("employee", "user_id", {"unique": True}),
+    ("team", "name", {"unique": True}),
+    ("attendance", [("user_id", ASCENDING), ("date", DESCENDING)], {}),
+    ("timesheet", [("user_id", ASCENDING), ("date", DESCENDING)], {}),
+]
+
+
+async def _ensure_indexes():
+    if db is None:
+        return
+    for collection, keys, options in _INDEXES:
+        try:
+            await db[collection].create_index(keys, **options)
+        except ServerSelectionTimeoutError:
+            # Mongo is unreachable; every remaining index would wait out the same timeout
+            return
+        except Exception:
+            # Missing indexes only cost performance (e.g. a unique index over
+            # pre-existing duplicates); never block startup on them
+            pass
+
+
 # Seed on startup if empty (no users)
-@app.on_event("startup")
-def _auto_seed_if_empty():
+async def _auto_seed_if_empty():
     try:
         if db is None:
             return
-        existing_users = get_documents("user", limit=1)
-        if not existing_users:
-            seed_demo_data()
+        # Collection metadata read; no cursor or document decode
+        if await db["user"].estimated_document_count() == 0:
+            await seed_demo_data()
     except Exception:
         # Avoid crashing startup if seeding fails
         pass
 
 
+async def _background_startup():
+    await _ensure_indexes()
+    await _auto_seed_if_empty()
+
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))